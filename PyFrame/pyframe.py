@@ -36,13 +36,61 @@ Pre-Impemented Artists include:
     - OneTimeArtist:
         A simple artist that draws itself on the Canvas on a single
         (possibly future) frame and is then deactivated automatically.
+
+    - TemplateArtist:
+        A simple artist that draws itself on the Canvas on every frame
+        and updates what it has drawn from frame to frame.
 """
 
 
-from string import ascii_lowercase
+import copy
+import os
+import numbers
+import secrets
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from ._decorator import doc_inherit
+from joblib import Parallel, delayed, effective_n_jobs
 import numpy as np
+import matplotlib
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.container import Container
+from matplotlib.figure import Figure
+
+
+# Kinds of artists whose activeness the Canvas evaluates for all of them at
+# once. Artists of any other class are asked through isActive and isDone.
+_ALWAYS, _TIMED, _TOGGLED, _ONE_TIME, _CUSTOM = range(5)
+_FIRST_FRAME, _LAST_FRAME = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+_MIN_LAYER, _MAX_LAYER = np.iinfo(np.int16).min, np.iinfo(np.int16).max
+_SCHEDULE_DTYPE = np.dtype([('kind', 'i1'), ('layer', 'i2'), ('start', 'i4'), ('end', 'i4'), ('on', 'u1'), ('finished', '?')])
+
+
+def _schedule(table, frame_counter):
+    # Returns the rows of the artists to draw on the given frame and of the
+    # artists done after drawing it. One-time artists are done once drawn,
+    # custom artists are left to the Canvas.
+    active = ((table['kind'] != _CUSTOM) & table['on'].view(bool) & ~table['finished']
+              & (frame_counter >= table['start']) & (frame_counter <= table['end']))
+    done = (table['finished'] | ((table['kind'] == _TIMED) & (frame_counter > table['end']))
+            | (active & (table['kind'] == _ONE_TIME)))
+
+    return np.flatnonzero(active).astype(np.int32), np.flatnonzero(done).astype(np.int32)
+
+
+def _check_layer(artist, layer):
+    # The layers are stored as int16, anything else would be silently
+    # truncated and drawn in the wrong order.
+    if not isinstance(layer, numbers.Integral) or not _MIN_LAYER <= layer <= _MAX_LAYER:
+        raise ValueError("The layer of %s has to be an integer between %d and %d, got %r"
+                         % (artist, _MIN_LAYER, _MAX_LAYER, layer))
+
+
+def _draws_handles(artist):
+    # Whether the artist is drawn by Artist.draw, i.e. by drawing each of its
+    # handles as is, so that the Canvas may draw the handles itself.
+    return next(cls for cls in type(artist).__mro__ if 'draw' in cls.__dict__) is Artist
 
 
 class Artist():
@@ -52,6 +100,7 @@ class Artist():
         - TimedArtist
         - ToggledArtist
         - OneTimeArtist
+        - TemplateArtist
 
     Attributes
     ----------
@@ -59,18 +108,34 @@ class Artist():
         A unique identifier for the artist.
     artist_factory : function
         A function that takes an axes object as an argument and draws
-        something on it.
+        something on it. It is called once, the matplotlib artists it
+        adds to the axes are kept and redrawn on later frames. It should
+        only add artists: changes to the axes themselves (like titles or
+        limits) are not undone between frames, and colours from the
+        property cycle are assigned once, in the order in which the
+        artists are first drawn.
     layer : int, default = 0
-        The layer on which the artist should be drawn. Artists with a
-        lower layer number are drawn first.
+        The layer on which the artist should be drawn. Of matplotlib
+        artists with the same zorder, those of artists with a lower layer
+        number are drawn first. Has to be an integer fitting into an int16.
     deactivated : bool
         A flag indicating whether the artist still needs to be drawn
         on the Canvas.
+    animated : bool
+        A flag indicating whether the artist may appear or disappear
+        between frames. Non-animated artists at the bottom of the layer
+        stack are rendered into the cached background of the Canvas.
 
     Methods
     ----------
-    draw(ax)
+    getHandles(ax)
+        Returns the matplotlib artists drawn by the artist_factory.
+    draw(ax, frame_counter=None)
         Draws the artist on the Canvas.
+    hide()
+        Hides the matplotlib artists of the artist.
+    remove()
+        Removes the matplotlib artists of the artist from the axes.
     deactivate()
         Deactivates the artist.
     isActive(frame_counter)
@@ -80,6 +145,9 @@ class Artist():
     """
 
 
+    animated = False
+
+
     def __init__(self, artist_factory, layer=0):
         """
         Constructs all the necessary attributes for the Artist object.
@@ -94,13 +162,45 @@ class Artist():
             lower layer number are drawn first.
         """
 
-        self.id = ''.join(np.random.choice(list(ascii_lowercase), 10))
+        self.id = secrets.token_hex(8)
         self.artist_factory = artist_factory
         self.layer = layer
         self.deactivated = False
+        self._handles = None
+        self._canvas = None
+        self._row = None
 
 
-    def draw(self, ax):
+    def getHandles(self, ax):
+        """
+        Returns the matplotlib artists drawn by the artist_factory. The
+        artist_factory is only called on first use, the created artists
+        are marked as animated so that they are skipped by full redraws
+        of the figure.
+
+        Parameters
+        ----------
+        ax : Axes
+            The axes on which the artist should be drawn.
+
+        Returns
+        -------
+        list
+            The matplotlib artists added to the axes by the artist_factory.
+        """
+
+        if self._handles is None:
+            existing = set(ax.get_children())
+            self.artist_factory(ax)
+            self._handles = [child for child in ax.get_children() if child not in existing]
+
+            for handle in self._handles:
+                handle.set_animated(True)
+
+        return self._handles
+
+
+    def draw(self, ax, frame_counter=None):
         """
         Draws the artist on the Canvas.
 
@@ -108,10 +208,36 @@ class Artist():
         ----------
         ax : Axes
             The axes on which the artist should be drawn.
+        frame_counter : int, optional
+            The frame number which is drawn.
         """
 
-        self.artist_factory(ax)
-        plt.draw()
+        for handle in self.getHandles(ax):
+            handle.set_visible(True)
+            ax.draw_artist(handle)
+
+
+    def hide(self):
+        """
+        Hides the matplotlib artists of the artist, so that they are not
+        drawn on the Canvas until the artist is drawn again.
+        """
+
+        if self._handles is not None:
+            for handle in self._handles:
+                handle.set_visible(False)
+
+
+    def remove(self):
+        """
+        Removes the matplotlib artists of the artist from the axes.
+        """
+
+        if self._handles is not None:
+            for handle in self._handles:
+                handle.remove()
+
+            self._handles = None
 
 
     def deactivate(self):
@@ -163,9 +289,45 @@ class Artist():
 
 
     def __eq__(self, other):
+        if not isinstance(other, Artist):
+            return NotImplemented
+
         return self.id == other.id
 
 
+    def __hash__(self):
+        return hash(self.id)
+
+
+    def __setattr__(self, name, value):
+        scheduled = not name.startswith('_') and getattr(self, '_canvas', None) is not None
+
+        # Checked before assigning, so that a rejected layer leaves the
+        # artist in line with its row in the schedule.
+        if scheduled and name == 'layer':
+            _check_layer(self, value)
+
+        super().__setattr__(name, value)
+
+        if scheduled:
+            self._canvas._updateSchedule(self)
+
+
+    def _schedule(self):
+        # The row of the artist in the schedule of the Canvas: kind, start,
+        # end, on and finished, see _schedule.
+        return _ALWAYS, _FIRST_FRAME, _LAST_FRAME, True, self.deactivated
+
+
+    def __getstate__(self):
+        # The matplotlib artists belong to the figure of the Canvas and
+        # are recreated by the artist_factory wherever the artist is unpickled.
+        state = self.__dict__.copy()
+        state['_handles'] = None
+        state['_canvas'] = None
+        return state
+
+
 class TimedArtist(Artist):
     """
     A timed artist that draws itself on the Canvas in a given range of frames.
@@ -177,13 +339,22 @@ class TimedArtist(Artist):
         A unique identifier for the artist.
     artist_factory : function
         A function that takes an axes object as an argument and draws
-        something on it.
+        something on it. It is called once, the matplotlib artists it
+        adds to the axes are kept and redrawn on later frames. It should
+        only add artists: changes to the axes themselves (like titles or
+        limits) are not undone between frames, and colours from the
+        property cycle are assigned once, in the order in which the
+        artists are first drawn.
     layer : int, default = 0
-        The layer on which the artist should be drawn. Artists with a
-        lower layer number are drawn first.
+        The layer on which the artist should be drawn. Of matplotlib
+        artists with the same zorder, those of artists with a lower layer
+        number are drawn first. Has to be an integer fitting into an int16.
     deactivated : bool
         A flag indicating whether the artist still needs to be drawn
         on the Canvas.
+    animated : bool
+        A flag indicating whether the artist may appear or disappear
+        between frames.
     start : int
         The frame number on which the artist should start drawing itself.
     end : int
@@ -191,8 +362,14 @@ class TimedArtist(Artist):
 
     Methods
     ----------
-    draw(ax)
+    getHandles(ax)
+        Returns the matplotlib artists drawn by the artist_factory.
+    draw(ax, frame_counter=None)
         Draws the artist on the Canvas.
+    hide()
+        Hides the matplotlib artists of the artist.
+    remove()
+        Removes the matplotlib artists of the artist from the axes.
     deactivate()
         Deactivates the artist.
     isActive(frame_counter)
@@ -202,6 +379,9 @@ class TimedArtist(Artist):
     """
 
 
+    animated = True
+
+
     def __init__(self, artist_factory, start, end, layer=0):
         """
         Constructs all the necessary attributes for the TimedArtist object.
@@ -225,12 +405,6 @@ class TimedArtist(Artist):
         self.end = end
 
 
-    @doc_inherit 
-    def draw(self, ax):
-        self.artist_factory(ax)
-        plt.draw()
-
-
     @doc_inherit 
     def isActive(self, frame_counter):
         return frame_counter >= self.start and frame_counter <= self.end and not self.deactivated
@@ -241,6 +415,10 @@ class TimedArtist(Artist):
         return frame_counter > self.end or self.deactivated
 
 
+    def _schedule(self):
+        return _TIMED, self.start, self.end, True, self.deactivated
+
+
     def __str__(self):
         return "TimedArtist: %s, start: %d, end: %d" % (self.id, self.start, self.end)
 
@@ -256,20 +434,35 @@ class ToggledArtist(Artist):
         A unique identifier for the artist.
     artist_factory : function
         A function that takes an axes object as an argument and draws
-        something on it.
+        something on it. It is called once, the matplotlib artists it
+        adds to the axes are kept and redrawn on later frames. It should
+        only add artists: changes to the axes themselves (like titles or
+        limits) are not undone between frames, and colours from the
+        property cycle are assigned once, in the order in which the
+        artists are first drawn.
     layer : int, default = 0
-        The layer on which the artist should be drawn. Artists with a
-        lower layer number are drawn first.
+        The layer on which the artist should be drawn. Of matplotlib
+        artists with the same zorder, those of artists with a lower layer
+        number are drawn first. Has to be an integer fitting into an int16.
     deactivated : bool
         A flag indicating whether the artist still needs to be drawn
         on the Canvas.
+    animated : bool
+        A flag indicating whether the artist may appear or disappear
+        between frames.
     state : str
         The state of the artist. Can be 'active' or 'inactive'.
 
     Methods
     ----------
-    draw(ax)
+    getHandles(ax)
+        Returns the matplotlib artists drawn by the artist_factory.
+    draw(ax, frame_counter=None)
         Draws the artist on the Canvas.
+    hide()
+        Hides the matplotlib artists of the artist.
+    remove()
+        Removes the matplotlib artists of the artist from the axes.
     deactivate()
         Deactivates the artist.
     toggle()
@@ -281,6 +474,9 @@ class ToggledArtist(Artist):
     """
 
 
+    animated = True
+
+
     def __init__(self, artist_factory, state, layer=0):
         """
         Constructs all the necessary attributes for the ToggledArtist object.
@@ -301,10 +497,15 @@ class ToggledArtist(Artist):
         self.state = state
 
 
-    @doc_inherit 
-    def draw(self, ax):
-        self.artist_factory(ax)
-        plt.draw()
+    @property
+    def state(self):
+        return 'active' if self._on else 'inactive'
+
+
+    @state.setter
+    def state(self, state):
+        # Stored as a single byte to keep isActive and the schedule cheap.
+        self._on = np.uint8(state == 'active')
 
 
     def toggle(self):
@@ -312,17 +513,24 @@ class ToggledArtist(Artist):
         Toggles the artist on or off.
         """
 
-        self.state = 'active' if self.state == 'inactive' else 'inactive'
+        self._on ^= 1
+
+        if self._canvas is not None:
+            self._canvas._toggleSchedule(self)
 
 
     @doc_inherit 
     def isActive(self, frame_counter):
-        return self.state == 'active' and not self.deactivated
+        return bool(self._on) and not self.deactivated
 
 
     @doc_inherit 
     def isDone(self, frame_counter):
         return self.deactivated
+
+
+    def _schedule(self):
+        return _TOGGLED, _FIRST_FRAME, _LAST_FRAME, self._on, self.deactivated
     
 
     def __str__(self):
@@ -340,13 +548,22 @@ class OneTimeArtist(Artist):
         A unique identifier for the artist.
     artist_factory : function
         A function that takes an axes object as an argument and draws
-        something on it.
+        something on it. It is called once, the matplotlib artists it
+        adds to the axes are kept and redrawn on later frames. It should
+        only add artists: changes to the axes themselves (like titles or
+        limits) are not undone between frames, and colours from the
+        property cycle are assigned once, in the order in which the
+        artists are first drawn.
     layer : int, default = 0
-        The layer on which the artist should be drawn. Artists with a
-        lower layer number are drawn first.
+        The layer on which the artist should be drawn. Of matplotlib
+        artists with the same zorder, those of artists with a lower layer
+        number are drawn first. Has to be an integer fitting into an int16.
     deactivated : bool
         A flag indicating whether the artist still needs to be drawn
         on the Canvas.
+    animated : bool
+        A flag indicating whether the artist may appear or disappear
+        between frames.
     drawn : bool
         A flag indicating whether the artist has already been drawn on the Canvas.
     when : int
@@ -354,8 +571,14 @@ class OneTimeArtist(Artist):
 
     Methods
     ----------
-    draw(ax)
+    getHandles(ax)
+        Returns the matplotlib artists drawn by the artist_factory.
+    draw(ax, frame_counter=None)
         Draws the artist on the Canvas.
+    hide()
+        Hides the matplotlib artists of the artist.
+    remove()
+        Removes the matplotlib artists of the artist from the axes.
     deactivate()
         Deactivates the artist.
     toggle()
@@ -367,6 +590,9 @@ class OneTimeArtist(Artist):
     """
 
 
+    animated = True
+
+
     def __init__(self, artist_factory, when=0, layer=0):
         """
         Constructs all the necessary attributes for the OneTimeArtist object.
@@ -389,10 +615,9 @@ class OneTimeArtist(Artist):
 
 
     @doc_inherit 
-    def draw(self, ax):
-        self.artist_factory(ax)
+    def draw(self, ax, frame_counter=None):
+        super().draw(ax, frame_counter)
         self.drawn = True
-        plt.draw()
 
 
     @doc_inherit 
@@ -403,16 +628,188 @@ class OneTimeArtist(Artist):
     @doc_inherit 
     def isDone(self, frame_counter):
         return self.drawn or self.deactivated
+
+
+    def _schedule(self):
+        return _ONE_TIME, self.when, self.when, True, self.drawn or self.deactivated
     
 
     def __str__(self):
         return "OneTimeArtist: %s, drawn: %s" % (self.id, self.drawn)
 
 
+class TemplateArtist(Artist):
+    """
+    A template artist that draws itself on the Canvas on every frame and
+    updates the matplotlib artists created by its artist_factory from frame
+    to frame, instead of creating new ones. Updating existing artists (like
+    with Line2D.set_data or PathCollection.set_offsets) skips the argument
+    parsing and autoscaling done by the plotting methods of the axes.
+    Subclass of the Artist class.
+
+    Attributes
+    ----------
+    id : str
+        A unique identifier for the artist.
+    artist_factory : function
+        A function that takes an axes object as an argument, draws
+        something on it and returns the created matplotlib artist(s),
+        as a single artist, an iterable or a Container.
+        It is called once and, like the artist_factory of an Artist,
+        should only add artists.
+    updater : function
+        A function that takes the return value of the artist_factory and
+        the frame number as arguments and updates the matplotlib artist(s)
+        for that frame.
+    layer : int, default = 0
+        The layer on which the artist should be drawn. Of matplotlib
+        artists with the same zorder, those of artists with a lower layer
+        number are drawn first. Has to be an integer fitting into an int16.
+    deactivated : bool
+        A flag indicating whether the artist still needs to be drawn
+        on the Canvas.
+    animated : bool
+        A flag indicating whether the artist may appear or disappear
+        between frames.
+
+    Methods
+    ----------
+    getHandles(ax)
+        Returns the matplotlib artists drawn by the artist_factory.
+    draw(ax, frame_counter=None)
+        Draws the artist on the Canvas.
+    hide()
+        Hides the matplotlib artists of the artist.
+    remove()
+        Removes the matplotlib artists of the artist from the axes.
+    deactivate()
+        Deactivates the artist.
+    isActive(frame_counter)
+        Returns True if the artist should be drawn on the given frame.
+    isDone(frame_counter)
+        Returns True if the artist is done drawing itself on the Canvas.
+    """
+
+
+    animated = True
+
+
+    def __init__(self, artist_factory, updater, layer=0):
+        """
+        Constructs all the necessary attributes for the TemplateArtist object.
+
+        Parameters
+        ----------
+        artist_factory : function
+            A function that takes an axes object as an argument, draws
+            something on it and returns the created matplotlib artist(s),
+            as a single artist, an iterable or a Container.
+        updater : function
+            A function that takes the return value of the artist_factory
+            and the frame number as arguments and updates the matplotlib
+            artist(s) for that frame.
+        layer : int, default = 0
+            The layer on which the artist should be drawn. Artists with a
+            lower layer number are drawn first.
+        """
+
+        super().__init__(artist_factory, layer)
+        self.updater = updater
+        self._template = None
+
+
+    def getHandles(self, ax):
+        """
+        Returns the matplotlib artists returned by the artist_factory. The
+        artist_factory is only called on first use, the created artists
+        are marked as animated so that they are skipped by full redraws
+        of the figure.
+
+        Parameters
+        ----------
+        ax : Axes
+            The axes on which the artist should be drawn.
+
+        Returns
+        -------
+        list
+            The matplotlib artist returned by the artist_factory, the
+            elements of the iterable or the children of the Container
+            (like the BarContainer returned by ax.bar) it returned.
+
+        Raises
+        ------
+        TypeError
+            If the artist_factory returns None or anything else that is
+            neither a matplotlib artist nor an iterable of them.
+        """
+
+        if self._handles is None:
+            template = self.artist_factory(ax)
+
+            if template is None:
+                raise TypeError("The artist_factory of %s returned None instead of the matplotlib "
+                                "artist(s) it created" % self)
+            elif isinstance(template, Container):
+                handles = template.get_children()
+            elif isinstance(template, matplotlib.artist.Artist):
+                handles = [template]
+            else:
+                try:
+                    handles = list(template)
+                except TypeError:
+                    raise TypeError("The artist_factory of %s has to return matplotlib artist(s), got %r"
+                                    % (self, template)) from None
+
+            self._template = template
+            self._handles = handles
+
+            for handle in self._handles:
+                handle.set_animated(True)
+
+        return self._handles
+
+
+    @doc_inherit 
+    def draw(self, ax, frame_counter=None):
+        self.getHandles(ax)
+        self.updater(self._template, frame_counter)
+        super().draw(ax, frame_counter)
+
+
+    @doc_inherit 
+    def remove(self):
+        super().remove()
+        self._template = None
+
+
+    def _schedule(self):
+        # Scheduled like an Artist, defined here so that the Canvas does not
+        # treat the subclass as a custom artist.
+        return super()._schedule()
+
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state['_template'] = None
+        return state
+
+
+    def __str__(self):
+        return "TemplateArtist: %s" % self.id
+
+
 class Canvas():
     """
     A Canvas object that manages the drawing of Artists on a figure.
 
+    The matplotlib artists of an Artist are created once and stay on
+    the axes, they are only shown on the frames on which the Artist is
+    active. The axes are not cleared between frames, so changes made
+    to them by an artist_factory (like titles, limits or the position
+    in the property cycle) carry over to all later frames. Use
+    resetAxes() to start from fresh axes.
+
     Attributes
     ----------
     frame_counter : int
@@ -425,8 +822,8 @@ class Canvas():
         The figure on which the artists are drawn.
     ax : matplotlib.axes.Axes
         The axes on which the artists are drawn.
-    artists : list
-        A list of Artist objects.
+    artists : dict
+        The Artist objects by their id, in the order they were added.
     
     Methods
     ----------
@@ -452,6 +849,16 @@ class Canvas():
         Shows the figure.
     save(folder, filename)
         Saves the figure to a file.
+    saveRange(start, end, folder, fname, n_jobs=-1)
+        Saves the frames from start to end in parallel.
+    openStream(path, fps=30)
+        Starts encoding the streamed frames into a video file.
+    stream()
+        Encodes the drawn figure as the next frame of the video.
+    closeStream()
+        Finishes the video file.
+    close()
+        Waits for all saved figures to be written and finishes the video file.
     """
 
 
@@ -476,13 +883,47 @@ class Canvas():
         self.frame_counter = 1
         self.xlims = xlims
         self.ylims = ylims
-        self.fig = plt.figure(figsize=(width, height), dpi=dpi)
+        self.fig = self._createFigure(width, height, dpi)
         self.ax = self.fig.add_subplot(111)
-        self.artists = []
+        self.artists = {}
+
+        # The schedule of the artists, one row per artist in self.artists,
+        # kept sorted by layer so that the rows are in draw order.
+        self._table = np.empty(0, dtype=_SCHEDULE_DTYPE)
+        self._rows = np.empty(0, dtype=object)
+        self._sorted = True
+        self._events = None
+        self._window = None
+        self._done_rows = None
 
         self.ax.set_xlim(xlims)
         self.ax.set_ylim(ylims)
 
+        # The active artists and the axes decorations are drawn in the order
+        # of a full render of the axes. The leading steps which do not change
+        # between frames are rendered into the cached background.
+        self._background = None
+        self._active_artists = []
+        self._leading_steps = []
+        self._background_steps = []
+        self._foreground_steps = []
+        self._compiled_background = None
+        self._compiled_foreground = None
+        self.fig.canvas.mpl_connect('draw_event', self._onDraw)
+
+        self._output = None
+        self._output_template = None
+        self._stream = None
+
+        # The PNG encoding of saved frames overlaps with drawing the next ones,
+        # the pool is created on the first save and shut down by close().
+        self._save_pool = None
+        self._pending_saves = []
+
+
+    def _createFigure(self, width, height, dpi):
+        return plt.figure(figsize=(width, height), dpi=dpi)
+
 
     def addArtistFactory(self, artist_factory, type, **kwargs):
         """
@@ -500,8 +941,7 @@ class Canvas():
             Additional keyword arguments to be passed to the artist.
         """
 
-        self.artists += [type(artist_factory, **kwargs)]
-        self.artists.sort(key=lambda artist: artist.layer)
+        self.addArtist(type(artist_factory, **kwargs))
 
 
     def addArtist(self, artist):
@@ -512,10 +952,68 @@ class Canvas():
         ----------
         artist : Artist
             The artist to be added.
+
+        Raises
+        ------
+        ValueError
+            If the artist has already been added to this or another Canvas
+            or if its layer is not an integer fitting into an int16.
         """
 
-        self.artists += [artist]
-        self.artists.sort(key=lambda artist: artist.layer)
+        if artist.id in self.artists:
+            raise ValueError("%s has already been added to the Canvas" % artist)
+        if artist._canvas is not None:
+            raise ValueError("%s has already been added to another Canvas" % artist)
+
+        row = self._scheduleRow(artist)
+        if len(self._table) and row['layer'] < self._table['layer'][-1]:
+            self._sorted = False
+
+        self.artists[artist.id] = artist
+        self._table = np.append(self._table, row)
+        self._rows = np.append(self._rows, np.array([artist], dtype=object))
+        self._invalidateSchedule()
+        artist._canvas = self
+        artist._row = len(self._rows) - 1
+
+
+    def _scheduleRow(self, artist):
+        _check_layer(artist, artist.layer)
+
+        if '_schedule' in type(artist).__dict__:
+            kind, start, end, on, finished = artist._schedule()
+        else:
+            kind, start, end, on, finished = _CUSTOM, _FIRST_FRAME, _LAST_FRAME, False, False
+
+        return np.array((kind, artist.layer, start, end, on, finished), dtype=_SCHEDULE_DTYPE)
+
+
+    def _updateSchedule(self, artist):
+        row = self._scheduleRow(artist)
+
+        if row['layer'] != self._table[artist._row]['layer']:
+            self._sorted = False
+
+        self._table[artist._row] = row
+        self._invalidateSchedule()
+
+
+    def _toggleSchedule(self, artist):
+        self._table['on'][artist._row] ^= 1
+        self._invalidateSchedule()
+
+
+    def _sortByLayer(self):
+        # Artists on the same layer keep their order. The stable sort of
+        # the int16 layers is a radix sort in numpy.
+        if not self._sorted:
+            order = np.argsort(self._table['layer'], kind='stable')
+            self._table = self._table[order]
+            self._rows = self._rows[order]
+            self._sorted = True
+
+            for row, artist in enumerate(self._rows):
+                artist._row = row
 
 
     def getAllArtists(self, asString=False):
@@ -535,10 +1033,13 @@ class Canvas():
         list
             A list of all the artists on the Canvas.
         """
+        self._sortByLayer()
+        artists = list(self._rows)
+
         if asString:
-            return [str(artist) for artist in self.artists]
+            return [str(artist) for artist in artists]
         else:
-            return self.artists
+            return artists
 
 
     def getActiveArtists(self, asString=False):
@@ -559,28 +1060,207 @@ class Canvas():
             A list of all the currently active artists on the Canvas.
         """
 
+        active_artists = [artist for artist in self.getAllArtists() if artist.isActive(self.frame_counter)]
+
         if asString:
-            return [str(artist) for artist in self.artists if artist.isActive(self.frame_counter)]
+            return [str(artist) for artist in active_artists]
         else:
-            return [artist for artist in self.artists if artist.isActive(self.frame_counter)]
+            return active_artists
 
 
     def draw(self):
         """
         Draws all the artists on the Canvas and removes all done
-        or deactivated artists.
+        or deactivated artists. The frame is the same as a full render
+        of the figure, which draws the matplotlib artists by zorder.
         """
 
-        up_for_ramoval = []
-        for artist in self.artists:
-            if artist.isActive(self.frame_counter):
-                artist.draw(self.ax)
+        # The active artists only change at the start or end of an artist's
+        # range of frames or when an artist changes, so they are cached
+        # until the frame counter leaves the current window between two events.
+        if self._window is None or not self._window[0] <= self.frame_counter < self._window[1]:
+            self._window = self._scheduleWindow(self.frame_counter)
+            self._evaluateSchedule()
+
+        if self._background is None or self._leading_steps != self._background_steps:
+            self._background_steps = self._leading_steps
+            self._compiled_background = None
+            self.fig.canvas.draw()
+        else:
+            self.fig.canvas.restore_region(self._background)
+            self._drawForeground()
+
+        self.fig.canvas.blit(self.fig.bbox)
+
+        if self._done_rows is not None:
+            self._removeDoneArtists()
+
+
+    def _scheduleWindow(self, frame_counter):
+        # The range of frames around frame_counter in which no artist becomes
+        # active, inactive or done by the passing of frames alone.
+        if np.any(self._table['kind'] == _CUSTOM):
+            return frame_counter, frame_counter + 1
+
+        if self._events is None:
+            bounds = np.concatenate([self._table['start'], self._table['end'].astype(np.int64) + 1])
+            self._events = np.unique(bounds)
+
+        index = np.searchsorted(self._events, frame_counter, side='right')
+        first = self._events[index - 1] if index > 0 else -np.inf
+        last = self._events[index] if index < len(self._events) else np.inf
+        return first, last
+
+
+    def _invalidateSchedule(self):
+        self._events = None
+        self._window = None
+
+
+    def _evaluateSchedule(self):
+        self._sortByLayer()
+
+        active_rows, self._done_rows = _schedule(self._table, self.frame_counter)
+        custom_rows = np.flatnonzero(self._table['kind'] == _CUSTOM)
+        if len(custom_rows):
+            custom_active = np.fromiter((bool(self._rows[row].isActive(self.frame_counter)) for row in custom_rows),
+                                        dtype=bool, count=len(custom_rows))
+            active_rows = np.union1d(active_rows, custom_rows[custom_active])
+
+        active_artists = list(self._rows[active_rows])
+
+        active_ids = {artist.id for artist in active_artists}
+        for artist in self._active_artists:
+            if artist.id not in active_ids:
+                artist.hide()
+
+        self._active_artists = active_artists
+
+        # The leading steps drawing handles of non-animated artists or axes
+        # decorations are rendered into the background, which only has to be
+        # re-rendered once they change.
+        steps = self._drawSteps(active_artists)
+        n_background = 0
+        for artist, handle in steps:
+            if handle is None or (artist is not None and artist.animated):
+                break
+
+            n_background += 1
+
+        self._leading_steps = steps[:n_background]
+        foreground_steps = steps[n_background:]
+
+        if foreground_steps != self._foreground_steps:
+            self._foreground_steps = foreground_steps
+            self._compiled_foreground = None
+
+
+    def _drawSteps(self, active_artists):
+        # Returns (artist, handle) pairs in the order in which a full render
+        # of the axes draws them: sorted by zorder, with ties drawn in the
+        # order of the layers and the axes decorations (spines, axis, titles
+        # and anything else not drawn by an artist) last. Artists with their
+        # own draw method are drawn as a whole, as (artist, None), at the
+        # position of their lowest handle.
+        keyed_steps = []
+        for index, artist in enumerate(active_artists):
+            handles = artist.getHandles(self.ax)
+
+            if _draws_handles(artist):
+                keyed_steps += [((handle.get_zorder(), 0, index), artist, handle) for handle in handles]
+            else:
+                zorder = min((handle.get_zorder() for handle in handles), default=np.inf)
+                keyed_steps += [((zorder, 0, index), artist, None)]
+
+        # The decorations are marked as animated so that full redraws of the
+        # figure leave them to the Canvas, just like the artists' handles.
+        handles = {handle for artist in self._rows if artist._handles is not None for handle in artist._handles}
+        excluded = {self.ax.patch}
+        if not (self.ax.axison and self.ax.get_frame_on()):
+            excluded.update(self.ax.spines.values())
+        if not self.ax.axison:
+            excluded.update([self.ax.xaxis, self.ax.yaxis])
+
+        for index, child in enumerate(self.ax.get_children()):
+            if child not in handles and child not in excluded:
+                child.set_animated(True)
+                keyed_steps += [((child.get_zorder(), 1, index), None, child)]
+
+        keyed_steps.sort(key=lambda step: step[0])
+        return [(artist, handle) for _, artist, handle in keyed_steps]
 
-            if artist.isDone(self.frame_counter):
-                up_for_ramoval += [artist]
 
-        for artist in up_for_ramoval:
-            self.artists.remove(artist)
+    def _removeDoneArtists(self):
+        # Artists only become done at the start of a schedule window, so
+        # this runs once per window.
+        done_rows = self._done_rows
+        self._done_rows = None
+
+        custom_rows = np.flatnonzero(self._table['kind'] == _CUSTOM)
+        if len(custom_rows):
+            custom_done = np.fromiter((bool(self._rows[row].isDone(self.frame_counter)) for row in custom_rows),
+                                      dtype=bool, count=len(custom_rows))
+            done_rows = np.union1d(done_rows, custom_rows[custom_done])
+
+        if len(done_rows):
+            for artist in self._rows[done_rows]:
+                artist.remove()
+                artist._canvas = None
+                del self.artists[artist.id]
+
+            self._table = np.delete(self._table, done_rows)
+            self._rows = np.delete(self._rows, done_rows)
+            self._invalidateSchedule()
+
+            # Rows in front of the first removed one keep their position.
+            first_moved = done_rows[0]
+            for row, artist in enumerate(self._rows[first_moved:], start=first_moved):
+                artist._row = row
+
+
+    def _drawForeground(self):
+        if self._compiled_foreground is None:
+            self._compiled_foreground = self._compileSteps(self._foreground_steps)
+
+        self._compiled_foreground(self.ax, self.frame_counter)
+
+
+    def _compileSteps(self, steps):
+        # Generates a straight-line function drawing the given steps, which
+        # stay the same for a whole schedule window. Handles are drawn
+        # directly, artists with their own draw method have it called.
+        namespace = {'draw_artist': self.ax.draw_artist}
+        lines = ["def draw_steps(ax, frame_counter):"]
+
+        for index, (artist, handle) in enumerate(steps):
+            if handle is None:
+                namespace[f"artist_{index}"] = artist
+                lines += [f"    artist_{index}.draw(ax, frame_counter)"]
+            else:
+                if artist is not None:
+                    handle.set_visible(True)
+
+                namespace[f"handle_{index}"] = handle
+                lines += [f"    draw_artist(handle_{index})"]
+
+        lines += ["    pass"]
+        exec(compile("\n".join(lines), "<PyFrame steps>", "exec"), namespace)
+        return namespace['draw_steps']
+
+
+    def _onDraw(self, event):
+        # Renders of fig.savefig draw the animated artists themselves, at
+        # their own size and possibly in another format, so they neither
+        # provide the background nor need the steps drawn.
+        if event.canvas.is_saving():
+            return
+
+        if self._compiled_background is None:
+            self._compiled_background = self._compileSteps(self._background_steps)
+
+        self._compiled_background(self.ax, self.frame_counter)
+        self._background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self._drawForeground()
 
 
     def resetAxes(self):    
@@ -588,6 +1268,17 @@ class Canvas():
         Resets the axes.
         """
 
+        for artist in self.artists.values():
+            artist.remove()
+
+        self._background = None
+        self._active_artists = []
+        self._leading_steps = []
+        self._background_steps = []
+        self._foreground_steps = []
+        self._compiled_background = None
+        self._compiled_foreground = None
+        self._invalidateSchedule()
         self.ax.clear()
         self.ax.set_xlim(self.xlims)
         self.ax.set_ylim(self.ylims)
@@ -604,7 +1295,8 @@ class Canvas():
 
     def save(self, folder, fname):
         """
-        Saves the drawn figure to a file.
+        Saves the drawn figure to a file. The file is written in the
+        background, call close() to wait for it.
 
         Parameters
         ----------
@@ -612,20 +1304,210 @@ class Canvas():
             The folder to save the figure to.
         fname : str
             The name of the file to save the figure to.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the folder does not exist.
+        """
+
+        if self._output != (folder, fname):
+            if not os.path.isdir(folder):
+                raise FileNotFoundError("The folder '%s' does not exist" % folder)
+
+            self._output = (folder, fname)
+            self._output_template = os.path.join(folder, fname + "_{}.png")
+
+        self.draw()
+
+        # Raise errors of finished writes right away and hold at most two
+        # frames per encoding thread in memory.
+        for pending_save in [pending_save for pending_save in self._pending_saves if pending_save.done()]:
+            self._pending_saves.remove(pending_save)
+            pending_save.result()
+
+        if len(self._pending_saves) >= 4:
+            self._pending_saves.pop(0).result()
+
+        if self._save_pool is None:
+            self._save_pool = ThreadPoolExecutor(max_workers=2)
+
+        self._pending_saves += [self._save_pool.submit(
+            plt.imsave, self._output_template.format(self.frame_counter), np.array(self.fig.canvas.buffer_rgba()),
+            format='png', dpi=self.fig.dpi
+        )]
+        self.frame_counter += 1
+
+
+    def openStream(self, path, fps=30):
+        """
+        Starts an ffmpeg process encoding the frames passed by stream()
+        into a video file. The raw pixels of the figure are piped to
+        ffmpeg directly, without writing an image file per frame. The
+        ffmpeg executable is taken from matplotlib's
+        rcParams['animation.ffmpeg_path'].
+
+        The video is encoded as yuv420p, which requires even dimensions,
+        so a figure with an odd width or height in pixels is padded by
+        one pixel at the right or bottom edge.
+
+        Parameters
+        ----------
+        path : str
+            The path of the video file.
+        fps : int, default = 30
+            The frame rate of the video.
+
+        Raises
+        ------
+        RuntimeError
+            If a stream is already open.
         """
 
+        if self._stream is not None:
+            raise RuntimeError("A stream is already open, call closeStream() first")
+
+        width, height = (int(size) for size in self.fig.bbox.size)
+        self._stream = subprocess.Popen(
+            [matplotlib.rcParams['animation.ffmpeg_path'], '-y', '-loglevel', 'error',
+             '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', f'{width}x{height}', '-r', str(fps), '-i', 'pipe:',
+             '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', path],
+            stdin=subprocess.PIPE
+        )
+
+
+    def stream(self):
+        """
+        Encodes the drawn figure as the next frame of the video opened
+        by openStream().
+
+        Raises
+        ------
+        RuntimeError
+            If no stream has been opened with openStream().
+        """
+
+        if self._stream is None:
+            raise RuntimeError("No stream is open, call openStream() first")
+
         self.draw()
-        self.fig.savefig(f"{folder}/{fname}_{self.frame_counter}")
-        self.resetAxes()
+        self._stream.stdin.write(self.fig.canvas.buffer_rgba())
         self.frame_counter += 1
 
 
+    def closeStream(self):
+        """
+        Finishes the video opened by openStream() and waits for ffmpeg
+        to exit.
+
+        Raises
+        ------
+        RuntimeError
+            If no stream has been opened with openStream() or if ffmpeg
+            exits with a non-zero return code.
+        """
+
+        if self._stream is None:
+            raise RuntimeError("No stream is open, call openStream() first")
+
+        stream, self._stream = self._stream, None
+        stream.stdin.close()
+        returncode = stream.wait()
+
+        if returncode != 0:
+            raise RuntimeError("ffmpeg exited with return code %d" % returncode)
+
+
+    def close(self):
+        """
+        Waits for all figures passed to save() to be written and finishes
+        the video opened by openStream(), if any.
+        """
+
+        pending_saves, self._pending_saves = self._pending_saves, []
+
+        if self._save_pool is not None:
+            self._save_pool.shutdown(wait=True)
+            self._save_pool = None
+
+        for pending_save in pending_saves:
+            pending_save.result()
+
+        if self._stream is not None:
+            self.closeStream()
+
+
+    def saveRange(self, start, end, folder, fname, n_jobs=-1):
+        """
+        Saves the frames from start (inclusive) to end (exclusive) in
+        parallel. The frames are split into contiguous chunks which are
+        rendered by worker processes, each on its own copy of the Canvas
+        and of the artists. The artists are pickled with cloudpickle, so
+        their artist_factory may be a lambda but must not reference
+        unpicklable objects. With a single job the chunk is rendered in
+        the calling process.
+
+        Since the frames are rendered from a snapshot of the current
+        artists, changes made to the artists in between frames (like
+        toggling or deactivating them) are not possible. The Canvas
+        itself is left untouched.
+
+        Parameters
+        ----------
+        start : int
+            The first frame number to be saved.
+        end : int
+            The frame number after the last frame to be saved.
+        folder : str
+            The folder to save the figures to.
+        fname : str
+            The name of the files to save the figures to.
+        n_jobs : int, default = -1
+            The number of worker processes, -1 uses all CPUs.
+        """
+
+        n_chunks = max(1, min(effective_n_jobs(n_jobs), end - start))
+        bounds = np.linspace(start, end, n_chunks + 1).astype(int)
+        width, height = self.fig.get_size_inches()
+
+        Parallel(n_jobs=n_jobs)(
+            delayed(_save_frames)(list(self.artists.values()), range(chunk_start, chunk_end), width, height,
+                                  self.xlims, self.ylims, self.fig.dpi, folder, fname)
+            for chunk_start, chunk_end in zip(bounds[:-1], bounds[1:])
+        )
+
+
     def __str__(self):
         return f"The Canvas has {len(self.artists)} (possibly idle) artists:\n\t- " + "\n\t- ".join(self.getAllArtists(asString=True))
 
 
+class _AggCanvas(Canvas):
+    # A Canvas drawing on an Agg figure which is not managed by pyplot, so
+    # that rendering it leaves the backend and figures of pyplot untouched.
+    def _createFigure(self, width, height, dpi):
+        fig = Figure(figsize=(width, height), dpi=dpi)
+        FigureCanvasAgg(fig)
+        return fig
+
+
+def _save_frames(artists, frames, width, height, xlims, ylims, dpi, folder, fname):
+    # Runs in a worker process of Canvas.saveRange, or in the calling process
+    # when joblib runs a single job. The artists are copied through their
+    # __getstate__ in either case, so the ones of the caller stay untouched.
+    canvas = _AggCanvas(width, height, xlims, ylims, dpi)
+    for artist in copy.deepcopy(artists):
+        canvas.addArtist(artist)
+
+    canvas.frame_counter = frames.start
+    for _ in frames:
+        canvas.save(folder, fname)
+
+    canvas.close()
+
+
 if __name__ == "__main__":
-    import os
+    # The frames are only saved, so no interactive backend is needed.
+    matplotlib.use("Agg")
 
     if not os.path.exists('out/'):
         os.makedirs('out/')
@@ -641,6 +1523,8 @@ if __name__ == "__main__":
     canvas.addArtistFactory(lambda ax: ax.plot([5, 5], [0, 10]), TimedArtist, start=30, end=40)
     canvas.addArtist(toggled_artist)
     canvas.addArtistFactory(lambda ax: ax.scatter([5], [5], s=50), OneTimeArtist, when=25)
+    canvas.addArtistFactory(lambda ax: ax.scatter([0], [0], c='k'), TemplateArtist,
+                            updater=lambda points, frame: points.set_offsets([[frame / 5, frame / 5]]), layer=1)
 
     print(canvas, '\n')
     for i in range(50):
@@ -651,4 +1535,6 @@ if __name__ == "__main__":
             permanent_artist.deactivate()
 
         print(f"Frame {canvas.frame_counter}:\n\t- " + "\n\t- ".join(canvas.getActiveArtists(asString=True)) + "\n")
-        canvas.save('out', 'test')
\ No newline at end of file
+        canvas.save('out', 'test')
+
+    canvas.close()
\ No newline at end of file
@@ -0,0 +1,407 @@
+import sys
+
+import matplotlib
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from PyFrame import Artist, Canvas, OneTimeArtist, TemplateArtist, TimedArtist, ToggledArtist
+
+
+@pytest.fixture(autouse=True)
+def close_figures():
+    yield
+    plt.close("all")
+
+
+class BlinkingArtist(Artist):
+    """Custom artist returning non-bool truthy/falsy values."""
+
+    def isActive(self, frame_counter):
+        return frame_counter % 2
+
+    def isDone(self, frame_counter):
+        return 0
+
+
+def line(ax):
+    ax.plot([0, 1], [0, 1])
+
+
+def full_render(factories):
+    fig = plt.figure(figsize=(2, 2), dpi=100)
+    ax = fig.add_subplot(111)
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    for factory in factories:
+        factory(ax)
+    fig.canvas.draw()
+
+    return np.array(fig.canvas.buffer_rgba())
+
+
+def rendered(canvas):
+    return np.array(canvas.fig.canvas.buffer_rgba())
+
+
+def test_custom_artist_non_bool_predicates():
+    factories = [
+        lambda ax: ax.plot([0, 1], [0, 1], c='b'),
+        lambda ax: ax.plot([0, 1], [1, 0], c='r'),
+    ]
+
+    canvas = Canvas(2, 2)
+    for factory in factories:
+        canvas.addArtist(BlinkingArtist(factory))
+
+    for _ in range(4):
+        canvas.draw()
+        expected = factories if canvas.frame_counter % 2 else []
+        assert np.array_equal(rendered(canvas), full_render(expected))
+        canvas.frame_counter += 1
+
+    assert len(canvas.getAllArtists()) == 2
+
+
+def test_custom_artist_done():
+    class ShortArtist(Artist):
+        def isDone(self, frame_counter):
+            return frame_counter >= 2
+
+    canvas = Canvas(2, 2)
+    short = ShortArtist(line)
+    canvas.addArtist(short)
+    canvas.addArtist(BlinkingArtist(line))
+
+    canvas.draw()
+    assert short.id in canvas.artists
+
+    canvas.frame_counter += 1
+    canvas.draw()
+    assert short.id not in canvas.artists
+    assert len(canvas.artists) == 1
+
+
+def test_save_missing_folder_raises(tmp_path):
+    canvas = Canvas(2, 2)
+
+    with pytest.raises(FileNotFoundError):
+        canvas.save(str(tmp_path / "missing"), "frame")
+
+
+def test_close_writes_frames_and_shuts_down_pool(tmp_path):
+    canvas = Canvas(2, 2)
+    canvas.addArtist(Artist(line))
+
+    for _ in range(3):
+        canvas.save(str(tmp_path), "frame")
+
+    canvas.close()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["frame_1.png", "frame_2.png", "frame_3.png"]
+
+    canvas.save(str(tmp_path), "frame")
+    canvas.close()
+    assert (tmp_path / "frame_4.png").exists()
+
+
+def test_stream_without_open_raises():
+    canvas = Canvas(2, 2)
+
+    with pytest.raises(RuntimeError):
+        canvas.stream()
+
+    with pytest.raises(RuntimeError):
+        canvas.closeStream()
+
+
+def test_close_stream_failing_ffmpeg_raises(tmp_path, monkeypatch):
+    ffmpeg = tmp_path / "ffmpeg"
+    ffmpeg.write_text("#!%s\nimport sys\nsys.stdin.buffer.read()\nsys.exit(1)\n" % sys.executable)
+    ffmpeg.chmod(0o755)
+    monkeypatch.setitem(matplotlib.rcParams, "animation.ffmpeg_path", str(ffmpeg))
+
+    canvas = Canvas(2, 2)
+    canvas.addArtist(Artist(line))
+    canvas.openStream(str(tmp_path / "video.mp4"))
+    canvas.stream()
+
+    with pytest.raises(RuntimeError):
+        canvas.closeStream()
+
+    with pytest.raises(RuntimeError):
+        canvas.stream()
+
+
+def test_add_artist_to_second_canvas_raises():
+    first, second = Canvas(2, 2), Canvas(2, 2)
+    artist = Artist(line)
+    first.addArtist(artist)
+
+    with pytest.raises(ValueError):
+        first.addArtist(artist)
+
+    with pytest.raises(ValueError):
+        second.addArtist(artist)
+
+    assert first.getAllArtists() == [artist]
+    assert second.getAllArtists() == []
+
+
+def test_blitted_frame_matches_full_render():
+    factories = [
+        lambda ax: ax.plot([0, 1], [0, 1], c='b', lw=6),
+        lambda ax: ax.plot([0, 0], [0, 1], c='r', lw=6),
+        lambda ax: ax.scatter([0.5], [0.5], c='g', s=2000),
+    ]
+
+    canvas = Canvas(2, 2)
+    canvas.addArtist(Artist(factories[0]))
+    canvas.addArtist(TimedArtist(factories[1], start=2, end=3))
+    canvas.addArtist(ToggledArtist(factories[2], 'active'))
+
+    canvas.draw()
+    canvas.frame_counter = 2
+    canvas.draw()
+
+    assert np.array_equal(rendered(canvas), full_render(factories))
+
+
+@pytest.mark.parametrize("layer", [0.7, "1", 2 ** 15])
+def test_invalid_layer_raises(layer):
+    canvas = Canvas(2, 2)
+
+    with pytest.raises(ValueError):
+        canvas.addArtist(Artist(line, layer=layer))
+
+    artist = Artist(line, layer=3)
+    canvas.addArtist(artist)
+
+    with pytest.raises(ValueError):
+        artist.layer = layer
+
+    assert artist.layer == 3
+    canvas.addArtist(Artist(line, layer=2))
+    assert [artist.layer for artist in canvas.getAllArtists()] == [2, 3]
+
+
+def test_layers_are_ordered():
+    canvas = Canvas(2, 2)
+    artists = [Artist(line, layer=layer) for layer in (3, np.int64(-2), 1)]
+    for artist in artists:
+        canvas.addArtist(artist)
+
+    assert canvas.getAllArtists() == [artists[1], artists[2], artists[0]]
+
+
+def hide_first(template, frame):
+    # Hides the first of the matplotlib artists from the second frame on.
+    next(iter(template)).set_alpha(0 if frame > 1 else 1)
+
+
+@pytest.mark.parametrize("factory", [
+    lambda ax: ax.plot([0, 1], [0, 1], [0, 1], [1, 0]),
+    lambda ax: tuple(ax.plot([0, 1], [0, 1], [0, 1], [1, 0])),
+    lambda ax: ax.bar([0.25, 0.75], [0.5, 0.7], width=0.1),
+])
+def test_template_artist_handles(factory):
+    canvas = Canvas(2, 2)
+    canvas.addArtist(TemplateArtist(factory, hide_first))
+
+    canvas.draw()
+    assert np.array_equal(rendered(canvas), full_render([lambda ax: hide_first(factory(ax), 1)]))
+
+    canvas.frame_counter += 1
+    canvas.draw()
+    assert np.array_equal(rendered(canvas), full_render([lambda ax: hide_first(factory(ax), 2)]))
+
+
+def test_template_artist_single_handle():
+    factory = lambda ax: ax.plot([0, 1], [0, 1], c='b')[0]
+    updater = lambda handle, frame: handle.set_ydata([0, frame / 4])
+
+    canvas = Canvas(2, 2)
+    canvas.addArtist(TemplateArtist(factory, updater))
+
+    for frame in range(1, 4):
+        canvas.draw()
+        assert np.array_equal(rendered(canvas), full_render([lambda ax: updater(factory(ax), frame)]))
+        canvas.frame_counter += 1
+
+
+def test_template_artist_factory_returning_none_raises():
+    canvas = Canvas(2, 2)
+    canvas.addArtist(TemplateArtist(line, lambda template, frame: None))
+
+    with pytest.raises(TypeError):
+        canvas.draw()
+
+
+def make_timed_canvas():
+    canvas = Canvas(2, 2)
+    canvas.addArtist(Artist(lambda ax: ax.plot([0, 1], [0, 1], c='b')))
+    canvas.addArtist(TimedArtist(lambda ax: ax.plot([0, 1], [0.5, 0.5], c='r'), start=2, end=3))
+    canvas.addArtist(OneTimeArtist(lambda ax: ax.scatter([0.5], [0.25], c='g'), when=4))
+    return canvas
+
+
+def read_frames(folder):
+    return {path.name: plt.imread(path) for path in folder.iterdir()}
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_save_range_matches_save(tmp_path, n_jobs):
+    serial, parallel = tmp_path / "serial", tmp_path / "parallel"
+    serial.mkdir()
+    parallel.mkdir()
+
+    canvas = make_timed_canvas()
+    for _ in range(5):
+        canvas.save(str(serial), "frame")
+    canvas.close()
+
+    canvas = make_timed_canvas()
+    artists = canvas.getAllArtists()
+    canvas.saveRange(1, 6, str(parallel), "frame", n_jobs=n_jobs)
+
+    assert plt.fignum_exists(canvas.fig.number)
+    assert canvas.getAllArtists() == artists
+    assert canvas.frame_counter == 1
+
+    serial_frames, parallel_frames = read_frames(serial), read_frames(parallel)
+    assert sorted(parallel_frames) == sorted(serial_frames)
+    assert all(np.array_equal(serial_frames[name], parallel_frames[name]) for name in serial_frames)
+
+
+def test_replacing_background_artist_keeps_drawing():
+    factories = [
+        lambda ax: ax.plot([0, 1], [0, 1], c='b', zorder=2),
+        lambda ax: ax.plot([0, 1], [1, 0], c='r', zorder=3),
+        lambda ax: ax.plot([0, 1], [0.5, 0.5], c='g', zorder=2.6),
+    ]
+
+    canvas = Canvas(2, 2)
+    permanent = Artist(factories[0])
+    canvas.addArtist(permanent)
+    canvas.addArtist(Artist(factories[1]))
+    canvas.draw()
+
+    permanent.deactivate()
+    canvas.addArtist(Artist(factories[2]))
+    canvas.frame_counter += 1
+    canvas.draw()
+
+    assert np.array_equal(rendered(canvas), full_render(factories[1:]))
+
+
+def test_savefig_leaves_blitting_intact(tmp_path):
+    factories = [
+        lambda ax: ax.plot([0, 1], [0, 1], c='b', lw=6),
+        lambda ax: ax.plot([0, 0], [0, 1], c='r', lw=6),
+    ]
+
+    canvas = Canvas(2, 2)
+    canvas.addArtist(Artist(factories[0]))
+    canvas.addArtist(TimedArtist(factories[1], start=1, end=3))
+    canvas.draw()
+
+    canvas.fig.savefig(str(tmp_path / "frame.pdf"))
+    canvas.fig.savefig(str(tmp_path / "frame.svg"))
+    canvas.fig.savefig(str(tmp_path / "small.png"), dpi=50)
+    canvas.fig.savefig(str(tmp_path / "frame.png"))
+
+    saved = plt.imread(str(tmp_path / "frame.png"))
+    assert np.array_equal(np.round(saved * 255).astype(np.uint8), full_render(factories))
+
+    canvas.frame_counter += 1
+    canvas.draw()
+    assert np.array_equal(rendered(canvas), full_render(factories))
+
+
+def test_frames_follow_schedule_changes_within_a_window():
+    diagonal = lambda ax: ax.plot([0, 1], [0, 1], c='b')
+    anti_diagonal = lambda ax: ax.plot([0, 1], [1, 0], c='k')
+    horizontal = lambda ax: ax.plot([0, 1], [0.5, 0.5], c='r')
+    vertical = lambda ax: ax.plot([0.5, 0.5], [0, 1], c='g')
+    point = lambda ax: ax.scatter([0.25], [0.75], c='m')
+
+    permanent, timed = Artist(anti_diagonal), TimedArtist(horizontal, start=2, end=6)
+    toggled, one_time = ToggledArtist(vertical, 'inactive'), OneTimeArtist(point, when=6)
+    always = Artist(diagonal)
+
+    canvas = Canvas(2, 2)
+    for artist in (always, permanent, timed, toggled, one_time):
+        canvas.addArtist(artist)
+
+    changes = {
+        3: toggled.toggle,
+        4: lambda: (permanent.deactivate(), setattr(timed, 'end', 4)),
+        5: toggled.toggle,
+    }
+    expected_frames = {
+        1: [diagonal, anti_diagonal],
+        2: [diagonal, anti_diagonal, horizontal],
+        3: [diagonal, anti_diagonal, horizontal, vertical],
+        4: [diagonal, horizontal, vertical],
+        5: [diagonal],
+        6: [diagonal, point],
+        7: [diagonal],
+    }
+
+    for frame, expected in expected_frames.items():
+        changes.get(frame, lambda: None)()
+        canvas.draw()
+        assert np.array_equal(rendered(canvas), full_render(expected)), frame
+        canvas.frame_counter += 1
+
+    assert canvas.getAllArtists() == [always, toggled]
+
+
+def test_one_time_artist_is_removed_after_its_frame():
+    canvas = Canvas(2, 2)
+    one_time = OneTimeArtist(line, when=2)
+    canvas.addArtist(one_time)
+
+    canvas.draw()
+    assert canvas.getActiveArtists() == []
+    assert canvas.getAllArtists() == [one_time]
+
+    canvas.frame_counter += 1
+    assert canvas.getActiveArtists() == [one_time]
+    canvas.draw()
+    assert one_time.drawn
+    assert canvas.getAllArtists() == []
+
+    canvas.frame_counter += 1
+    canvas.draw()
+    assert np.array_equal(rendered(canvas), full_render([]))
+
+
+def test_foreground_follows_layer_changes_and_reset():
+    red = lambda ax: ax.plot([0, 1], [0.5, 0.5], c='r', lw=10)
+    blue = lambda ax: ax.plot([0, 1], [0.5, 0.5], c='b', lw=10)
+    green = lambda ax: ax.plot([0.5, 0.5], [0, 1], c='g', lw=10)
+
+    first, second = TimedArtist(red, start=1, end=10), TimedArtist(blue, start=1, end=10)
+    canvas = Canvas(2, 2)
+    canvas.addArtist(first)
+    canvas.addArtist(second)
+
+    canvas.draw()
+    assert np.array_equal(rendered(canvas), full_render([red, blue]))
+
+    canvas.frame_counter += 1
+    first.layer = 1
+    canvas.draw()
+    assert np.array_equal(rendered(canvas), full_render([blue, red]))
+
+    canvas.frame_counter += 1
+    canvas.addArtist(TimedArtist(green, start=1, end=10, layer=2))
+    canvas.draw()
+    assert np.array_equal(rendered(canvas), full_render([blue, red, green]))
+
+    canvas.frame_counter += 1
+    canvas.resetAxes()
+    canvas.draw()
+    assert np.array_equal(rendered(canvas), full_render([blue, red, green]))